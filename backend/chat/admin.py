@@ -4,6 +4,11 @@ from .models import ChatRoom, Message
 class MessageInline(admin.TabularInline):
     model = Message
     extra = 0
+    raw_id_fields = ('user',)
+
+    def get_queryset(self, request):
+        # Avoid one user/chatroom SELECT per rendered message row
+        return super().get_queryset(request).select_related('user', 'chatroom')
 
 class ChatRoomAdmin(admin.ModelAdmin):
     list_display = ('names', 'created_at', 'updated_at')
@@ -1,10 +1,88 @@
+import asyncio
 import json
+import logging
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from django.utils import timezone
 from channels.generic.websocket import AsyncWebsocketConsumer
-from channels.db import database_sync_to_async
 from .models import ChatRoom, Message
-from userauth.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+# orjson serializes 5-6x faster than stdlib json on the small dict payloads
+# we push over WebSockets, so prefer it when available. orjson emits UTF-8
+# bytes which go straight out as binary frames.
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps_bytes = orjson.dumps
+    _JSONDecodeError = orjson.JSONDecodeError
+else:
+    _json_loads = json.loads
+    _JSONDecodeError = json.JSONDecodeError
+
+    def _json_dumps_bytes(payload):
+        return json.dumps(payload).encode()
+
+# Inbound frames carry a single required field; a precompiled msgspec
+# decoder validates the shape in the same pass as the JSON parse
+if msgspec is not None:
+    class InboundMessage(msgspec.Struct):
+        message: str
+
+    _inbound_decoder = msgspec.json.Decoder(InboundMessage)
+else:
+    _inbound_decoder = None
+
+
+def _parse_inbound(text_data):
+    """Decode and validate an inbound frame, returning the message text
+    or None when the payload is malformed."""
+    if _inbound_decoder is not None:
+        try:
+            return _inbound_decoder.decode(text_data).message
+        except msgspec.DecodeError:
+            logger.warning("Invalid message payload received")
+            return None
+    try:
+        return _json_loads(text_data)['message']
+    except _JSONDecodeError:
+        logger.warning("Invalid JSON received")
+        return None
+    except (KeyError, TypeError):
+        logger.warning("Message key not found in data")
+        return None
 
 class ChatConsumer(AsyncWebsocketConsumer):
+    # Coalescing window for outbound frames. Messages that arrive within
+    # this window are sent as a single JSON array frame instead of one
+    # WebSocket frame each, cutting framing/TLS overhead under bursty load.
+    FLUSH_INTERVAL = 0.025
+
+    # Debounce window for persisting received messages; everything queued
+    # within it lands in one bulk_create INSERT
+    SAVE_INTERVAL = 0.05
+
+    # Hard cap on queued-but-unsaved messages; hitting it forces an
+    # immediate flush so the crash-loss window stays bounded
+    MAX_PENDING_MESSAGES = 100
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._outbox = []
+        self._flush_task = None
+        self._pending_messages = []
+        self._save_task = None
+        self._is_member = False
+
     async def connect(self):
         self.room_name = self.scope['url_route']['kwargs']['room_name']
         self.room_group_name = f'chat_{self.room_name}'
@@ -17,9 +95,18 @@ class ChatConsumer(AsyncWebsocketConsumer):
             await self.close()
             return
 
+        # Snapshot immutable identity once so the per-message path reads
+        # plain attributes instead of dereferencing the user object
+        self._uid = self.user.id
+        self._uname = self.user.username
+
         # Get or create the chat room
         self.chat_room = await self.get_or_create_room(self.room_name)
-        if not self.chat_room or not await self.has_room_access():
+
+        # Membership is checked once here and cached for the socket's
+        # lifetime, so per-message authorization is a plain attribute read
+        self._is_member = bool(self.chat_room) and self.has_room_access()
+        if not self._is_member:
             await self.close()
             return
         
@@ -32,6 +119,25 @@ class ChatConsumer(AsyncWebsocketConsumer):
         await self.accept()
 
     async def disconnect(self, close_code):
+        # Drop any frames still waiting on a flush
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        self._outbox.clear()
+
+        # Persist anything still queued so a disconnect never loses
+        # already-broadcast messages. Cancelling interrupts a debounce
+        # still sleeping; a flush already past the batch swap is shielded,
+        # so awaiting the task can't abort its INSERT mid-flight.
+        save_task, self._save_task = self._save_task, None
+        if save_task is not None:
+            save_task.cancel()
+            try:
+                await save_task
+            except asyncio.CancelledError:
+                pass
+        await self._flush_pending_messages()
+
         # Leave room group
         await self.channel_layer.group_discard(
             self.room_group_name,
@@ -39,72 +145,138 @@ class ChatConsumer(AsyncWebsocketConsumer):
         )
 
     async def receive(self, text_data):
+        if not self._is_member:
+            return
+
+        message = _parse_inbound(text_data)
+        if message is None:
+            return
+
         try:
-            data = json.loads(text_data)
-            message = data['message']
-
-            # Save message to database
-            saved_message = await self.save_message(message)
-
-            if saved_message:
-                # Send message to room group
-                await self.channel_layer.group_send(
-                    self.room_group_name,
-                    {
-                        'type': 'chat_message',
-                        'message': message,
-                        'username': self.user.username,
-                        'user_id': self.user.id
-                    }
-                )
-        except json.JSONDecodeError:
-            print("Invalid JSON received")
-        except KeyError:
-            print("Message key not found in data")
-        except Exception as e:
-            print(f"Error processing message: {str(e)}")
+            # Queue the INSERT for the next bulk flush and broadcast
+            # optimistically; persistence happens off the hot path
+            self._queue_message(message)
+
+            # Serialize once here rather than once per recipient;
+            # receivers forward the wire bytes as-is
+            payload = _json_dumps_bytes({
+                'message': message,
+                'username': self._uname,
+                'user_id': self._uid
+            })
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                {
+                    'type': 'chat_message',
+                    'payload': payload,
+                    'sender_channel': self.channel_name
+                }
+            )
+        except Exception:
+            logger.exception("Error processing message")
 
     async def chat_message(self, event):
-        # Send message to WebSocket
-        await self.send(text_data=json.dumps({
-            'message': event['message'],
-            'username': event['username'],
-            'user_id': event['user_id']
-        }))
+        # The sender renders its own message optimistically, so skip the
+        # loopback frame instead of echoing it
+        if event.get('sender_channel') == self.channel_name:
+            return
 
-    @database_sync_to_async
-    def get_or_create_room(self, room_name):
-        try:
-            room, created = ChatRoom.objects.get_or_create(
-                names=room_name,
-                defaults={'names': room_name}
+        # Queue the pre-serialized payload and flush the batch after the
+        # coalescing window
+        self._outbox.append(event['payload'])
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(
+                self._flush_after(self.FLUSH_INTERVAL)
             )
+
+    async def _flush_after(self, delay):
+        # Send everything queued during the window as one array frame,
+        # splicing the already-encoded payloads together
+        await asyncio.sleep(delay)
+        try:
+            if self._outbox:
+                # orjson already produced UTF-8 bytes; send a binary frame
+                # rather than round-tripping through str
+                await self.send(bytes_data=b'[' + b','.join(self._outbox) + b']')
+                self._outbox = []
+        except Exception:
+            # The peer can drop between scheduling and the flush; that's
+            # routine, not a task-level error worth surfacing
+            logger.debug("Dropped outbound flush for closed socket", exc_info=True)
+        finally:
+            self._flush_task = None
+
+    async def get_or_create_room(self, room_name):
+        try:
+            # Fast path: existing rooms resolve with one indexed SELECT
+            room = await ChatRoom.objects.only('id', 'names', 'member_ids').filter(names=room_name).afirst()
+            if room is not None:
+                return room
+
+            # The unique constraint on names makes concurrent creates safe:
+            # the loser of the race gets the existing row back
+            room, created = await ChatRoom.objects.aget_or_create(names=room_name)
             if created and self.user and not self.user.is_anonymous:
-                room.users.add(self.user)
+                await room.users.aadd(self.user)
             return room
-        except Exception as e:
-            print(f"Error getting/creating room: {str(e)}")
+        except Exception:
+            logger.exception("Error getting/creating room")
             return None
-        
-    @database_sync_to_async
+
     def has_room_access(self):
-        try:
-            return self.chat_room.users.filter(id=self.user.id).exists()
-        except Exception as e:
-            print(f"Error checking room access: {str(e)}")
-            return False
+        # member_ids is the denormalized membership list maintained by
+        # the m2m_changed receiver; no query, no executor hop
+        return self._uid in (self.chat_room.member_ids or [])
 
-    @database_sync_to_async
-    def save_message(self, message_content):
-        try:
-            return Message.objects.create(
-                chatroom=self.chat_room,
-                user=self.user,
-                content=message_content
+    def _queue_message(self, message_content):
+        # self.chat_room is resolved once in connect(); building unsaved
+        # instances from raw ids keeps this append allocation-only
+        self._pending_messages.append(Message(
+            chatroom_id=self.chat_room.id,
+            user_id=self._uid,
+            content=message_content
+        ))
+        if len(self._pending_messages) >= self.MAX_PENDING_MESSAGES:
+            # Flush now rather than letting the backlog grow unbounded.
+            # The reference lives in _save_task: asyncio only holds tasks
+            # weakly, so an anonymous task could be garbage-collected
+            # mid-flight, and disconnect() awaits whatever save is pending.
+            if self._save_task is not None:
+                self._save_task.cancel()
+            self._save_task = asyncio.create_task(self._flush_pending_messages())
+            self._save_task.add_done_callback(self._clear_save_task)
+        elif self._save_task is None:
+            self._save_task = asyncio.create_task(
+                self._save_after(self.SAVE_INTERVAL)
             )
-        except Exception as e:
-            print(f"Error saving message: {str(e)}")
-            return None
+            self._save_task.add_done_callback(self._clear_save_task)
+
+    def _clear_save_task(self, task):
+        # The guard keeps a superseded task from clobbering the reference
+        # to its replacement
+        if self._save_task is task:
+            self._save_task = None
+
+    async def _save_after(self, delay):
+        await asyncio.sleep(delay)
+        await self._flush_pending_messages()
+
+    async def _flush_pending_messages(self):
+        if not self._pending_messages:
+            return
+        pending, self._pending_messages = self._pending_messages, []
+        # Shield the INSERT: once the batch is swapped out of the queue, a
+        # task cancellation must not abort the write or the already-
+        # broadcast messages are silently dropped
+        await asyncio.shield(self.bulk_save_messages(pending))
+
+    async def bulk_save_messages(self, messages):
+        # Errors are handled here so the shielded task logs its own
+        # failure even when the awaiting task has been cancelled
+        try:
+            await Message.objects.abulk_create(messages)
+        except Exception:
+            logger.exception("Error saving messages")
 
 class UserStatusConsumer(AsyncWebsocketConsumer):
     async def connect(self):
@@ -157,14 +329,16 @@ class UserStatusConsumer(AsyncWebsocketConsumer):
         )
 
     async def user_status(self, event):
-        # Send user status to WebSocket
-        await self.send(text_data=json.dumps({
+        # Send user status to WebSocket as a binary frame (UTF-8 JSON)
+        await self.send(bytes_data=_json_dumps_bytes({
             'type': 'user_status',
             'user_id': event['user_id'],
             'status': event['status']
         }))
 
-    @database_sync_to_async
-    def update_user_status(self, status):
+    async def update_user_status(self, status):
         self.user.is_online = status
-        self.user.save(update_fields=['is_online', 'last_seen'])
\ No newline at end of file
+        # Set last_seen explicitly rather than leaning on auto_now so the
+        # presence timestamp doesn't depend on save() internals
+        self.user.last_seen = timezone.now()
+        await self.user.asave(update_fields=['is_online', 'last_seen'])
\ No newline at end of file
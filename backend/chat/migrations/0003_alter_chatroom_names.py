@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-08-31 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_message_msg_room_ts_idx_message_msg_unread_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='chatroom',
+            name='names',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
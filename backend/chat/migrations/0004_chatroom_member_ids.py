@@ -0,0 +1,26 @@
+# Generated by Django 5.2 on 2026-08-31 02:12
+
+from django.db import migrations, models
+
+
+def backfill_member_ids(apps, schema_editor):
+    ChatRoom = apps.get_model('chat', 'ChatRoom')
+    for room in ChatRoom.objects.all():
+        room.member_ids = list(room.users.values_list('id', flat=True))
+        room.save(update_fields=['member_ids'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_alter_chatroom_names'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatroom',
+            name='member_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(backfill_member_ids, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,16 @@
 from django.db import models
+from django.db.models.signals import m2m_changed
+from django.dispatch import receiver
 from userauth.models import CustomUser
 
 class ChatRoom(models.Model):
-    names = models.CharField(max_length=255)
+    # Unique so room lookups by name are an indexed point query and
+    # concurrent get_or_create calls can't insert duplicate rooms
+    names = models.CharField(max_length=255, unique=True)
     users = models.ManyToManyField(CustomUser, related_name="chatrooms")
+    # Denormalized copy of the member user ids, kept in sync by the
+    # m2m_changed receiver below so access checks never need the join table
+    member_ids = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -13,6 +20,31 @@ class ChatRoom(models.Model):
     def __str__(self):
         return f'{self.names}'
 
+@receiver(m2m_changed, sender=ChatRoom.users.through)
+def sync_room_member_ids(sender, instance, action, reverse, pk_set, **kwargs):
+    # On a reverse clear (user.chatrooms.clear()) pk_set is None and the
+    # through rows are gone by post_clear, so snapshot the affected rooms
+    # first; member_ids is the consumer's authorization source of truth
+    # and must not go stale on any mutation path
+    if action == 'pre_clear' and reverse:
+        instance._cleared_room_pks = list(
+            instance.chatrooms.values_list('pk', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        if action == 'post_clear':
+            pks = getattr(instance, '_cleared_room_pks', [])
+        else:
+            pks = pk_set or []
+        rooms = ChatRoom.objects.filter(pk__in=pks)
+    else:
+        rooms = [instance]
+    for room in rooms:
+        room.member_ids = list(room.users.values_list('id', flat=True))
+        room.save(update_fields=['member_ids'])
+
 class Message(models.Model):
     chatroom = models.ForeignKey(ChatRoom, related_name="messages", on_delete=models.CASCADE)
     user = models.ForeignKey(CustomUser, related_name="messages", on_delete=models.CASCADE)
@@ -21,7 +53,14 @@ class Message(models.Model):
     is_read = models.BooleanField(default=False)
 
     class Meta:
-        ordering = ['timestamp']
+        # No default ordering: it would append a hidden ORDER BY to every
+        # message queryset; callers that need an order say so explicitly
+        indexes = [
+            # Matches room history listing and last-message lookups
+            models.Index(fields=['chatroom', '-timestamp'], name='msg_room_ts_idx'),
+            # Matches the unread-messages filter in MarkMessagesAsRead
+            models.Index(fields=['chatroom', 'is_read', 'user'], name='msg_unread_idx'),
+        ]
 
     def __str__(self):
         return f'{self.user.email}: {self.content} [{self.timestamp}]'
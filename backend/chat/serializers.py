@@ -20,7 +20,13 @@ class ChatRoomSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
     def get_last_message(self, obj):
-        last_message = obj.messages.first()
+        # Use the prefetched newest-first message list when the view
+        # supplied one; fall back to a direct query otherwise
+        prefetched = getattr(obj, '_prefetched_last', None)
+        if prefetched is not None:
+            last_message = prefetched[0] if prefetched else None
+        else:
+            last_message = obj.messages.select_related('user__profile').order_by('-timestamp').first()
         if last_message:
             return MessageSerializer(last_message).data
         return None
\ No newline at end of file
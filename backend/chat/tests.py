@@ -1,5 +1,8 @@
+from datetime import timedelta
+
 from django.test import TestCase
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework.authtoken.models import Token
@@ -30,6 +33,20 @@ class ChatModelsTest(TestCase):
         self.assertTrue(self.chatroom.created_at)
         self.assertTrue(self.chatroom.updated_at)
 
+    def test_member_ids_follows_membership_changes(self):
+        """Test member_ids stays in sync on every m2m mutation path"""
+        self.chatroom.refresh_from_db()
+        self.assertCountEqual(self.chatroom.member_ids, [self.user1.id, self.user2.id])
+
+        self.chatroom.users.remove(self.user2)
+        self.chatroom.refresh_from_db()
+        self.assertEqual(self.chatroom.member_ids, [self.user1.id])
+
+        # Reverse clear: the user leaves all of their rooms at once
+        self.user1.chatrooms.clear()
+        self.chatroom.refresh_from_db()
+        self.assertEqual(self.chatroom.member_ids, [])
+
     def test_message_creation(self):
         """Test Message model"""
         message = Message.objects.create(
@@ -140,6 +157,45 @@ class ChatViewsTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)
 
+    def test_list_messages_bad_cursor(self):
+        """Test a malformed before cursor returns 400, not page 1"""
+        url = reverse('message-list', kwargs={'chatroom_id': self.chatroom.id})
+        for cursor in ['garbage', '2024-13-45T99:99']:
+            response = self.client.get(url, {'before': cursor})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_messages_cursor_chaining(self):
+        """Test keyset pagination pages through history via X-Next-Before"""
+        page_size = 50
+        messages = Message.objects.bulk_create([
+            Message(chatroom=self.chatroom, user=self.user1, content=f'msg {i}')
+            for i in range(page_size + 10)
+        ])
+        # Spread the timestamps so the cursor ordering is deterministic
+        base = timezone.now()
+        for i, message in enumerate(messages):
+            Message.objects.filter(pk=message.pk).update(
+                timestamp=base + timedelta(seconds=i)
+            )
+
+        url = reverse('message-list', kwargs={'chatroom_id': self.chatroom.id})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), page_size)
+        # Pages are rendered chronologically: the newest 50 messages
+        self.assertEqual(response.data[0]['content'], 'msg 10')
+        self.assertEqual(response.data[-1]['content'], 'msg 59')
+        self.assertTrue(response.has_header('X-Next-Before'))
+        # The cursor must survive a query string without percent-encoding
+        self.assertNotIn('+', response['X-Next-Before'])
+
+        response = self.client.get(url, {'before': response['X-Next-Before']})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response.data[0]['content'], 'msg 0')
+        self.assertEqual(response.data[-1]['content'], 'msg 9')
+        self.assertFalse(response.has_header('X-Next-Before'))
+
     def test_mark_messages_as_read(self):
         """Test marking messages as read"""
         message = Message.objects.create(
@@ -154,6 +210,21 @@ class ChatViewsTest(APITestCase):
         message.refresh_from_db()
         self.assertTrue(message.is_read)
 
+    def test_mark_messages_as_read_requires_membership(self):
+        """Test non-members cannot toggle read flags"""
+        other_room = ChatRoom.objects.create(names='Private Room')
+        other_room.users.add(self.user2)
+        message = Message.objects.create(
+            chatroom=other_room,
+            user=self.user2,
+            content='Test message'
+        )
+        url = reverse('mark-messages-read', kwargs={'chatroom_id': other_room.id})
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        message.refresh_from_db()
+        self.assertFalse(message.is_read)
+
     def test_get_chat_users(self):
         """Test getting available users to chat with"""
         url = reverse('chat-users')
@@ -3,8 +3,9 @@ from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
-from django.db.models import Q
-from rest_framework.exceptions import NotAuthenticated
+from django.db.models import Q, Prefetch
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotAuthenticated, ValidationError
 from rest_framework.authentication import get_authorization_header
 from .models import ChatRoom, Message
 from .serializers import ChatRoomSerializer, MessageSerializer
@@ -29,7 +30,21 @@ class ChatRoomListCreateView(generics.ListCreateAPIView):
         super().permission_denied(request, message, code)
 
     def get_queryset(self):
-        return ChatRoom.objects.filter(users=self.request.user)
+        # Prefetch participants and the latest message per room so the
+        # serializer doesn't issue one query per room (N+1)
+        return ChatRoom.objects.filter(users=self.request.user).prefetch_related(
+            Prefetch(
+                'users',
+                queryset=CustomUserSerializer.setup_eager_loading(CustomUser.objects.all())
+            ),
+            Prefetch(
+                'messages',
+                # Sliced prefetch (Django 4.2+) so only the newest message
+                # per room is fetched, not each room's full history
+                queryset=Message.objects.select_related('user__profile').order_by('-timestamp')[:1],
+                to_attr='_prefetched_last'
+            )
+        )
 
     def create(self, request, *args, **kwargs):
         names = request.data.get('names', 'New Chat')
@@ -64,25 +79,64 @@ class MessageListCreateView(generics.ListCreateAPIView):
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
 
+    # Keyset page size; pages stay O(log N + PAGE_SIZE) at any scroll depth
+    PAGE_SIZE = 50
+
     def permission_denied(self, request, message=None, code=None):
         if not request.successful_authenticator:
             raise NotAuthenticated()
         super().permission_denied(request, message, code)
 
     def get_queryset(self):
-        room_name = self.kwargs.get('room_name')
+        chatroom_id = self.kwargs.get('chatroom_id')
         try:
-            chatroom = ChatRoom.objects.get(names=room_name, users=self.request.user)
-            return Message.objects.filter(
-                chatroom=chatroom
-            ).select_related('user').order_by('timestamp')[:50]
+            chatroom = ChatRoom.objects.get(id=chatroom_id, users=self.request.user)
         except ChatRoom.DoesNotExist:
             return Message.objects.none()
 
+        queryset = Message.objects.filter(chatroom=chatroom).select_related(
+            'user__profile'
+        ).defer('user__password')
+
+        # Keyset cursor: ?before=<iso_timestamp> pages backwards through
+        # history without OFFSET scans. parse_datetime returns None on
+        # garbage and raises ValueError on well-formed-but-invalid input
+        # (month 13 etc.); both are a broken cursor and get a 400, not a
+        # silent re-serve of page 1.
+        raw_before = self.request.query_params.get('before', '')
+        try:
+            before = parse_datetime(raw_before)
+        except ValueError:
+            before = None
+        if raw_before and before is None:
+            raise ValidationError({'before': 'Invalid timestamp cursor.'})
+        if before:
+            queryset = queryset.filter(timestamp__lt=before)
+
+        return queryset.order_by('-timestamp')[:self.PAGE_SIZE]
+
+    def list(self, request, *args, **kwargs):
+        page = list(self.get_queryset())
+
+        # Cursor for the next-older page when this one is full
+        next_before = ''
+        if len(page) == self.PAGE_SIZE:
+            # Z suffix instead of +00:00: an unencoded '+' in a query
+            # string decodes to a space and silently breaks the cursor
+            next_before = page[-1].timestamp.isoformat().replace('+00:00', 'Z')
+
+        # Pages are fetched newest-first but rendered chronologically
+        page.reverse()
+        serializer = self.get_serializer(page, many=True)
+        response = Response(serializer.data)
+        if next_before:
+            response['X-Next-Before'] = next_before
+        return response
+
     def create(self, request, *args, **kwargs):
-        room_name = self.kwargs.get('room_name')
+        chatroom_id = self.kwargs.get('chatroom_id')
         try:
-            chatroom = ChatRoom.objects.get(names=room_name, users=request.user)
+            chatroom = ChatRoom.objects.get(id=chatroom_id, users=request.user)
         except ChatRoom.DoesNotExist:
             return Response(
                 {'error': 'Chat room not found or access denied'},
@@ -108,8 +162,10 @@ class ChatUsersView(APIView):
         super().permission_denied(request, message, code)
 
     def get(self, request):
-        # Get all users except the current user
-        users = CustomUser.objects.exclude(id=request.user.id)
+        # Get all users except the current user, with profiles joined
+        users = CustomUserSerializer.setup_eager_loading(
+            CustomUser.objects.exclude(id=request.user.id)
+        )
         serializer = CustomUserSerializer(users, many=True)
         return Response(serializer.data)
 
@@ -122,10 +178,18 @@ class MarkMessagesAsRead(APIView):
         super().permission_denied(request, message, code)
 
     def post(self, request, chatroom_id):
-        # Mark all unread messages in the chatroom that were not sent by the current user
+        # Only members of the room may toggle read flags
+        if not ChatRoom.objects.filter(id=chatroom_id, users=request.user).exists():
+            return Response(
+                {'error': 'Chat room not found or access denied'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        # Mark all unread messages in the chatroom that were not sent by the
+        # current user. "Not sent by me" is a direct exclude on the message
+        # row, so this is a single UPDATE with no user-table subquery.
         Message.objects.filter(
             chatroom_id=chatroom_id,
-            user__in=CustomUser.objects.exclude(id=request.user.id),
             is_read=False
-        ).update(is_read=True)
+        ).exclude(user_id=request.user.id).update(is_read=True)
         return Response(status=status.HTTP_200_OK)
@@ -11,20 +11,38 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", os.getenv("DJANGO_SETTINGS_MODUL
 from django.core.asgi import get_asgi_application
 django_asgi_app = get_asgi_application()
 
-# Now safely import channels-related modules (AFTER app registry is ready)
-from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
-from channels.security.websocket import AllowedHostsOriginValidator
-from chat.routing import websocket_urlpatterns  # <-- safe now
+from channels.routing import ProtocolTypeRouter
+
+
+class LazyWebsocketApp:
+    """Builds the channels WebSocket stack on first connection.
+
+    The auth/validator middleware and the consumer module (which pulls in
+    orjson/msgspec) stay out of the HTTP cold-start path; a process that
+    never receives a WebSocket connection never imports them.
+    """
+
+    def __init__(self):
+        self._app = None
+
+    async def __call__(self, scope, receive, send):
+        if self._app is None:
+            from channels.auth import AuthMiddlewareStack
+            from channels.routing import URLRouter
+            from channels.security.websocket import AllowedHostsOriginValidator
+            from chat.routing import websocket_urlpatterns
+
+            self._app = AllowedHostsOriginValidator(
+                AuthMiddlewareStack(
+                    URLRouter(
+                        websocket_urlpatterns
+                    )
+                )
+            )
+        return await self._app(scope, receive, send)
+
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
-    "websocket": AllowedHostsOriginValidator(
-        AuthMiddlewareStack(
-            URLRouter(
-                websocket_urlpatterns
-            )
-        )
-    ),
+    "websocket": LazyWebsocketApp(),
 })
-
@@ -0,0 +1,29 @@
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes compact responses with orjson.
+
+    Pretty-printed output (the browsable API's indent) and environments
+    without orjson fall back to the stdlib encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = None
+        if accepted_media_type:
+            indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # default=str covers the odd non-native type (Decimal, lazy
+        # strings) the stdlib encoder would coerce
+        return orjson.dumps(data, default=str)
@@ -9,6 +9,7 @@ class UserProfileInline(admin.StackedInline):
 class CustomUserAdmin(UserAdmin):
     inlines = (UserProfileInline,)
     list_display = ('email', 'username', 'first_name', 'last_name', 'is_staff', 'is_online')
+    list_select_related = ('profile',)
     search_fields = ('email', 'username', 'first_name', 'last_name')
     ordering = ('email',)
 
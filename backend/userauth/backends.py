@@ -0,0 +1,23 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .models import CustomUser, USER_CACHE_KEY, USER_CACHE_TTL
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend with a cache in front of the per-request user lookup.
+
+    Session-authenticated requests call get_user on every request; the
+    post_save/post_delete receivers in models.py invalidate the cached
+    row whenever the user or their profile changes.
+    """
+
+    def get_user(self, user_id):
+        key = USER_CACHE_KEY.format(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = CustomUser.objects.select_related('profile').get(pk=user_id)
+            except CustomUser.DoesNotExist:
+                return None
+            cache.set(key, user, USER_CACHE_TTL)
+        return user if self.user_can_authenticate(user) else None
@@ -1,7 +1,16 @@
+from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 
+# Cache key/TTL for per-user rows; auth paths read users far more often
+# than they change, so a short TTL plus signal invalidation is enough
+USER_CACHE_KEY = 'user:{}'
+USER_REPR_CACHE_KEY = 'user_repr:{}'
+USER_CACHE_TTL = 300
+
 class CustomUser(AbstractUser):
     email = models.EmailField(_('email address'), unique=True)
     phone_number = models.CharField(max_length=15, blank=True, null=True)
@@ -16,9 +25,25 @@ class CustomUser(AbstractUser):
         return self.email
 
 class UserProfile(models.Model):
-    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)
+    user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='profile')
     bio = models.TextField(blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/', blank=True, null=True)
 
     def __str__(self):
-        return self.user.username
\ No newline at end of file
+        return self.user.username
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_user_cache(sender, instance, **kwargs):
+    cache.delete_many([
+        USER_CACHE_KEY.format(instance.pk),
+        USER_REPR_CACHE_KEY.format(instance.pk),
+    ])
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile_user_cache(sender, instance, **kwargs):
+    cache.delete_many([
+        USER_CACHE_KEY.format(instance.user_id),
+        USER_REPR_CACHE_KEY.format(instance.user_id),
+    ])
\ No newline at end of file
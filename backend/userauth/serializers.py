@@ -1,13 +1,46 @@
+import copy
+
+from django.core.cache import cache
+from django.db import transaction
 from rest_framework import serializers
-from .models import CustomUser, UserProfile
+from .models import CustomUser, UserProfile, USER_REPR_CACHE_KEY, USER_CACHE_TTL
 
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = UserProfile
         fields = ['bio', 'profile_picture']
 
+class LightUserSerializer(serializers.ModelSerializer):
+    """Read-only projection for high-frequency polls: identity and
+    presence only, no nested profile."""
+
+    class Meta:
+        model = CustomUser
+        fields = ['id', 'username', 'is_online', 'last_seen']
+        read_only_fields = fields
+
 class CustomUserSerializer(serializers.ModelSerializer):
-    profile = UserProfileSerializer(required=False)
+    # Read side is a method field: inlining a two-key dict beats
+    # instantiating a nested serializer per response. Writes still
+    # validate through UserProfileSerializer (see _validated_profile_data).
+    profile = serializers.SerializerMethodField()
+
+    def get_fields(self):
+        # The Meta introspection (model field walk, extra_kwargs merge)
+        # yields the same map for every instance; build it once per class
+        # and deepcopy so each serializer binds fresh field instances
+        cls = type(self)
+        cached = cls.__dict__.get('_cached_fields')
+        if cached is None:
+            cached = super().get_fields()
+            cls._cached_fields = cached
+        return copy.deepcopy(cached)
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # Preload the OneToOne profile so serialization never lazy-loads
+        # it; the password hash is the one wide column reads never need
+        return queryset.select_related('profile').defer('password')
 
     class Meta:
         model = CustomUser
@@ -19,36 +52,79 @@ class CustomUserSerializer(serializers.ModelSerializer):
             'is_online': {'read_only': True}
         }
 
+    def to_representation(self, instance):
+        # Two cache layers: a per-response memo (message lists repeat the
+        # same few senders) over a cross-request cache, invalidated by the
+        # post_save/post_delete receivers in models.py
+        if instance.pk is None:
+            return super().to_representation(instance)
+        local = getattr(self.root, '_user_repr_cache', None)
+        if local is None:
+            local = self.root._user_repr_cache = {}
+        if instance.pk not in local:
+            key = USER_REPR_CACHE_KEY.format(instance.pk)
+            data = cache.get(key)
+            if data is None:
+                data = super().to_representation(instance)
+                cache.set(key, data, USER_CACHE_TTL)
+            local[instance.pk] = data
+        return local[instance.pk]
+
+    def get_profile(self, obj):
+        profile = getattr(obj, 'profile', None)
+        if profile is None:
+            return None
+        return {
+            'bio': profile.bio,
+            'profile_picture': profile.profile_picture.url if profile.profile_picture else None,
+        }
+
+    def _validated_profile_data(self):
+        # Method fields are read-only, so profile input arrives via
+        # initial_data; run it through the profile serializer for validation
+        raw_profile = self.initial_data.get('profile') if self.initial_data else None
+        if not raw_profile:
+            return None
+        profile_serializer = UserProfileSerializer(data=raw_profile)
+        profile_serializer.is_valid(raise_exception=True)
+        return profile_serializer.validated_data
+
     def create(self, validated_data):
-        profile_data = validated_data.pop('profile', None)
+        profile_data = self._validated_profile_data()
         password = validated_data.pop('password')
-        user = CustomUser(**validated_data)
-        user.set_password(password)
-        user.save()
 
-        if profile_data:
-            UserProfile.objects.create(user=user, **profile_data)
-        else:
-            UserProfile.objects.create(user=user)
+        # One transaction, one commit: the user and profile INSERTs either
+        # both land or neither does
+        with transaction.atomic():
+            user = CustomUser(**validated_data)
+            user.set_password(password)
+            user.save()
+            UserProfile.objects.create(user=user, **(profile_data or {}))
 
         return user
 
     def update(self, instance, validated_data):
-        profile_data = validated_data.pop('profile', None)
+        profile_data = self._validated_profile_data()
         password = validated_data.pop('password', None)
-        
+
+        # Write only the columns that actually changed instead of all
+        # eleven; saves WAL bytes and avoids clobbering concurrent writes
+        update_fields = []
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-            
+            update_fields.append(attr)
+
         if password:
             instance.set_password(password)
-            
-        instance.save()
+            update_fields.append('password')
+
+        if update_fields:
+            instance.save(update_fields=update_fields)
 
         if profile_data:
             profile = instance.profile
             for attr, value in profile_data.items():
                 setattr(profile, attr, value)
-            profile.save()
+            profile.save(update_fields=list(profile_data))
 
         return instance
\ No newline at end of file
@@ -0,0 +1,68 @@
+import hashlib
+import hmac
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+User = get_user_model()
+
+class LoginViewTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser1',
+            email='test1@example.com',
+            password='testpass123'
+        )
+        self.url = reverse('login')
+
+    def _login(self, password):
+        return self.client.post(
+            self.url,
+            {'email': 'test1@example.com', 'password': password},
+            format='json'
+        )
+
+    def _neg_key(self, email, password):
+        digest = hmac.new(
+            settings.SECRET_KEY.encode(), password.encode(), 'sha256'
+        ).hexdigest()[:16]
+        return f'auth_neg:{email}:{digest}'
+
+    def test_login_success(self):
+        """Test logging in with valid credentials"""
+        response = self._login('testpass123')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['email'], 'test1@example.com')
+
+    def test_failed_login_short_circuits_from_cache(self):
+        """Test a repeated bad pair is rejected without a hash check"""
+        response = self._login('wrongpass')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertTrue(cache.get(self._neg_key('test1@example.com', 'wrongpass')))
+
+        with mock.patch.object(User, 'check_password') as mocked_check:
+            response = self._login('wrongpass')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        mocked_check.assert_not_called()
+
+    def test_correct_password_unaffected_by_prior_failure(self):
+        """Test a corrected password logs in despite a cached failure"""
+        response = self._login('wrongpass')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self._login('testpass123')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_negative_cache_key_is_hmac_derived(self):
+        """Test cached failures are keyed with the server secret, not a
+        plain password hash"""
+        self._login('wrongpass')
+        plain_digest = hashlib.sha256('wrongpass'.encode()).hexdigest()[:16]
+        self.assertIsNone(cache.get(f'auth_neg:test1@example.com:{plain_digest}'))
+        self.assertTrue(cache.get(self._neg_key('test1@example.com', 'wrongpass')))
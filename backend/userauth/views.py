@@ -1,20 +1,28 @@
+import hmac
+
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
-from django.contrib.auth import authenticate, login, logout
+from django.conf import settings
+from django.contrib.auth import login, logout
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.middleware.csrf import get_token
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from .serializers import CustomUserSerializer
+from .models import USER_CACHE_KEY, USER_CACHE_TTL
+from .serializers import CustomUserSerializer, LightUserSerializer
 
 User = get_user_model()
 
 class GetCSRFToken(APIView):
     permission_classes = (AllowAny,)
-    
+
     def get(self, request):
+        # get_token only masks the current secret, so it's cheap enough to
+        # run every time; caching the token would go stale when login()
+        # rotates the CSRF secret
         return Response({'csrfToken': get_token(request)})
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -28,18 +36,37 @@ class LoginView(APIView):
         if not email or not password:
             return Response({'error': 'Please provide both email and password'},
                           status=status.HTTP_400_BAD_REQUEST)
-        
-        # Use email as username since we're using email-based authentication
-        user = authenticate(request, username=email, password=password)
-        
-        if user is not None:
-            login(request, user)
-            serializer = CustomUserSerializer(user)
-            return Response(serializer.data)
-        else:
+
+        # Retried bad credentials (misconfigured clients, scripted retries)
+        # shouldn't burn an Argon2 verification each time: remember failed
+        # email/password pairs for a short window and reject them outright.
+        # HMAC with the server secret, not a plain hash: cache contents
+        # must not be offline-crackable password material.
+        digest = hmac.new(
+            settings.SECRET_KEY.encode(), password.encode(), 'sha256'
+        ).hexdigest()[:16]
+        neg_key = f'auth_neg:{email}:{digest}'
+        if cache.get(neg_key):
             return Response({'error': 'Invalid credentials'},
                           status=status.HTTP_401_UNAUTHORIZED)
 
+        # Single SELECT: fetch by email with the profile joined and verify
+        # the hash directly instead of dispatching through the backend chain
+        user = User.objects.select_related('profile').filter(email=email).first()
+
+        if user is None:
+            # Burn a hash anyway so a missing account isn't distinguishable
+            # from a wrong password by response time
+            User().set_password(password)
+        elif user.check_password(password) and user.is_active:
+            login(request, user, backend='userauth.backends.CachedModelBackend')
+            serializer = CustomUserSerializer(user)
+            return Response(serializer.data)
+
+        cache.set(neg_key, 1, timeout=30)
+        return Response({'error': 'Invalid credentials'},
+                      status=status.HTTP_401_UNAUTHORIZED)
+
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     permission_classes = (AllowAny,)
@@ -47,7 +74,10 @@ class RegisterView(generics.CreateAPIView):
 
     def perform_create(self, serializer):
         user = serializer.save()
-        login(self.request, user)
+        login(self.request, user, backend='userauth.backends.CachedModelBackend')
+        # Serialize the response from a profile-joined instance rather
+        # than lazy-loading the freshly created profile
+        serializer.instance = User.objects.select_related('profile').get(pk=user.pk)
 
 class LogoutView(APIView):
     def post(self, request):
@@ -58,6 +88,25 @@ class LogoutView(APIView):
 class UserDetailView(generics.RetrieveUpdateAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = CustomUserSerializer
-    
+
+    def get_serializer_class(self):
+        # ?light=1 serves presence polls without the profile join or the
+        # full field walk
+        if self.request.query_params.get('light'):
+            return LightUserSerializer
+        return CustomUserSerializer
+
     def get_object(self):
-        return self.request.user
\ No newline at end of file
+        # Presence polls need nothing beyond the row auth middleware
+        # already loaded
+        if self.request.query_params.get('light'):
+            return self.request.user
+
+        # Serve the profile-joined row from cache; the post_save receivers
+        # in models.py invalidate it whenever user or profile change
+        pk = self.request.user.pk
+        return cache.get_or_set(
+            USER_CACHE_KEY.format(pk),
+            lambda: User.objects.select_related('profile').get(pk=pk),
+            USER_CACHE_TTL
+        )
\ No newline at end of file
@@ -62,8 +62,10 @@ export default function Chat() {
     // Connect to status WebSocket
     const statusWs = new WebSocket('ws://localhost:8000/ws/status/');
 
-    statusWs.onmessage = (event) => {
-      const data = JSON.parse(event.data);
+    statusWs.onmessage = async (event) => {
+      // Server sends binary frames of UTF-8 JSON
+      const raw = event.data instanceof Blob ? await event.data.text() : event.data;
+      const data = JSON.parse(raw);
       if (data.type === 'user_status') {
         setUsers((prevUsers) =>
           prevUsers.map((u) =>
@@ -90,7 +92,7 @@ export default function Chat() {
     if (!activeRoom) return;
 
     // Fetch chat history for the active room
-    fetchChatHistory(activeRoom.names);
+    fetchChatHistory(activeRoom.id);
 
     // Connect to WebSocket for the active room
     const wsUrl = getWebSocketUrl(activeRoom.names);
@@ -100,16 +102,21 @@ export default function Chat() {
       console.log('WebSocket connected');
     };
 
-    ws.onmessage = (event) => {
+    ws.onmessage = async (event) => {
       try {
-        const data: WebSocketMessage = JSON.parse(event.data);
-        const newMessage: Message = {
-          id: messages.length + 1,
-          sender: data.username,
-          content: data.message,
+        // Server sends binary frames of UTF-8 JSON and batches bursty
+        // traffic into array frames; normalize so a single-message frame
+        // and a batched frame take the same path
+        const raw = event.data instanceof Blob ? await event.data.text() : event.data;
+        const data = JSON.parse(raw);
+        const batch: WebSocketMessage[] = Array.isArray(data) ? data : [data];
+        const received: Message[] = batch.map((item, index) => ({
+          id: messages.length + index + 1,
+          sender: item.username,
+          content: item.message,
           timestamp: new Date().toISOString(),
-        };
-        setMessages((prev) => [...prev, newMessage]);
+        }));
+        setMessages((prev) => [...prev, ...received]);
       } catch (error) {
         console.error('Error parsing message:', error);
       }
@@ -156,12 +163,12 @@ export default function Chat() {
 
   /**
    * Fetches chat history for a specific room
-   * @param roomName - Name of the room to fetch history for
+   * @param roomId - Id of the room to fetch history for
    */
-  const fetchChatHistory = async (roomName: string) => {
+  const fetchChatHistory = async (roomId: number) => {
     try {
       const response = await fetch(
-        `http://localhost:8000/chat/rooms/${roomName}/messages/`,
+        `http://localhost:8000/chat/rooms/${roomId}/messages/`,
         {
           credentials: 'include',
         }
@@ -214,6 +221,18 @@ export default function Chat() {
       })
     );
 
+    // Render optimistically; the server no longer echoes frames back to
+    // their sender
+    setMessages((prev) => [
+      ...prev,
+      {
+        id: prev.length + 1,
+        sender: user?.username ?? 'me',
+        content: newMessage,
+        timestamp: new Date().toISOString(),
+      },
+    ]);
+
     setNewMessage('');
   };
 